@@ -0,0 +1,84 @@
+"""
+cache.py — disk-backed LRU cache for processed documents.
+
+Entries are keyed by "<file_hash>:<engine>" and hold the segmented cases plus
+the raw OCR text, so they can be large. They live in a diskcache store
+(SQLite index + value files) so results survive restarts and only hot entries
+stay in RAM via the OS page cache; diskcache evicts least-recently-used
+entries once the store exceeds its size limit.
+"""
+import os
+import threading
+from typing import Optional
+
+import diskcache
+
+# File next to the store recording which document /case and /debug read
+# from; kept outside the store so eviction can never drop it
+_RECENT_FILE = "most_recent"
+
+
+class LRUCache:
+    """
+    Least-recently-used cache of processed documents, persisted on disk.
+
+    Values are pickled dicts. The key of the most recently stored or read
+    entry is persisted alongside them, so it also survives restarts, and the
+    entry itself is kept in memory so reading it back costs no disk I/O.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self._store = diskcache.Cache(
+            directory,
+            size_limit=max_bytes,
+            eviction_policy="least-recently-used",
+        )
+        self._recent_path = os.path.join(directory, _RECENT_FILE)
+        try:
+            with open(self._recent_path, encoding="utf-8") as f:
+                recent_key: Optional[str] = f.read() or None
+        except OSError:
+            recent_key = None
+        # (key, entry) of the most recent document; the entry is loaded
+        # lazily after a restart. Swapped as one tuple under the lock since
+        # put() runs in worker threads.
+        self._recent: tuple[Optional[str], Optional[dict]] = (recent_key, None)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._store.get(key)
+        if entry is not None:
+            self._touch(key, entry)
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        self._store.set(key, entry)
+        self._touch(key, entry)
+
+    def _touch(self, key: str, entry: dict) -> None:
+        with self._lock:
+            changed = key != self._recent[0]
+            self._recent = (key, entry)
+            if changed:
+                tmp_path = self._recent_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(key)
+                os.replace(tmp_path, self._recent_path)
+
+    def most_recent(self) -> Optional[dict]:
+        """
+        The most recently stored or accessed entry, or None if there is none
+        (or it was evicted before a restart). Only reads from disk the first
+        time after a restart.
+        """
+        key, entry = self._recent
+        if entry is not None or key is None:
+            return entry
+        entry = self._store.get(key)
+        with self._lock:
+            if entry is not None and self._recent[0] == key:
+                self._recent = (key, entry)
+        return entry
+
+    def close(self) -> None:
+        self._store.close()
@@ -3,30 +3,39 @@ os.environ["FLAGS_use_mkldnn"] = "0"
 os.environ["FLAGS_enable_pir_api"] = "0"
 os.environ["FLAGS_enable_pir_in_executor"] = "0"
 os.environ["OMP_NUM_THREADS"] = "1"
+import io
 import time
+import asyncio
 import hashlib
-import tempfile
 import logging
+import tempfile
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 from fastapi.responses import PlainTextResponse
+from cache import LRUCache
 from models import UploadResponse, CaseResponse
+from ocr.azure_extractor import open_client, close_client
 from ocr.factory import get_extractor
 from segmentation import segment_cases
 
 # Limit to first page only for debugging (set to 0 for all pages)
 MAX_PAGES = 1
 
+# Size of each read from the upload stream (1 MiB). Large chunks keep
+# hashlib's OpenSSL SHA-256 (SHA-NI / ARMv8 crypto where available) on its
+# fast path instead of paying per-call overhead.
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 load_dotenv()
 
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s  %(levelname)-8s  %(message)s",
 )
 logger = logging.getLogger(__name__)
@@ -43,19 +52,46 @@ app.add_middleware(
 )
 
 # ---------------------------------------------------------------------------
-# In-memory cache  {file_hash: {"cases": {...}, "engine": str, "pages": int, "raw_text": str}}
+# Disk-backed LRU cache  {cache_key: {"cases": {...}, "engine": str, "pages": int, "raw_text": str}}
+# Persists across restarts. The most recently processed entry is the one
+# /case and /debug read from.
 # ---------------------------------------------------------------------------
-cache: dict[str, dict] = {}
+CACHE_DIR = os.getenv(
+    "CACHE_DIR", os.path.join(tempfile.gettempdir(), "ocr_cases")
+)
+MAX_CACHE_BYTES = int(os.getenv("MAX_CACHE_BYTES", str(5 << 30)))
 
-# Store the most recently processed file hash so /case can look it up
-current_file_hash: str | None = None
+cache = LRUCache(CACHE_DIR, MAX_CACHE_BYTES)
 
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Lifecycle
 # ---------------------------------------------------------------------------
-def _sha256(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+@app.on_event("startup")
+async def warm_up_engines():
+    """Load PaddleOCR's models before the first /upload needs them."""
+    try:
+        # get_extractor() constructs PaddleOCR (the model load) on first use,
+        # so it has to run in the worker thread too
+        await asyncio.to_thread(lambda: get_extractor("paddle").warmup())
+    except Exception:
+        logger.warning("PaddleOCR warm-up failed; it will load on first use", exc_info=True)
+
+
+@app.on_event("startup")
+async def open_http_client():
+    """Open the pooled HTTP/2 client shared by all Azure requests."""
+    open_client()
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await close_client()
+
+
+@app.on_event("shutdown")
+async def close_cache():
+    cache.close()
 
 
 # ---------------------------------------------------------------------------
@@ -67,20 +103,26 @@ async def upload_pdf(
     selected_engine: str = Form(...),
 ):
     """Upload a PDF and run OCR + case segmentation."""
-    global current_file_hash
-
     if file.content_type not in ("application/pdf", "application/octet-stream"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
 
-    pdf_bytes = await file.read()
-    file_hash = _sha256(pdf_bytes)
+    # Hash the upload in chunks; Starlette has already spooled it (to disk
+    # once it is large), so the same stream is handed to the extractor
+    # without copying it into another temp file or fully into memory.
+    # hashlib releases the GIL for large buffers, so hashing in a worker
+    # thread runs alongside the event loop.
+    hasher = hashlib.sha256()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        await asyncio.to_thread(hasher.update, chunk)
+    await file.seek(0)
+
+    file_hash = hasher.hexdigest()
     cache_key = f"{file_hash}:{selected_engine}"
 
     # Return cached result if same file + engine was already processed
-    # if cache_key in cache:
+    # cached = cache.get(cache_key)
+    # if cached is not None:
     #     logger.info("Cache hit for %s (%s)", file_hash[:12], selected_engine)
-    #     cached = cache[cache_key]
-    #     current_file_hash = cache_key
     #     return UploadResponse(
     #         total_cases_detected=len(cached["cases"]),
     #         pages_processed=cached["pages"],
@@ -88,77 +130,69 @@ async def upload_pdf(
     #         engine_used=cached["engine"],
     #     )
 
-    # Write to temp file for OCR engines that need a file path
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    try:
-        tmp.write(pdf_bytes)
-        tmp.close()
-
-        start = time.time()
+    start = time.time()
 
-        extractor = get_extractor(selected_engine)
-        raw_text = await extractor.extract(tmp.name, max_pages=MAX_PAGES)
+    extractor = get_extractor(selected_engine)
+    raw_text = await extractor.extract(
+        file.file, max_pages=MAX_PAGES, pdf_hash=file_hash
+    )
 
-        # ── DEBUG: Print raw OCR text to console ──
-        print("\n" + "=" * 60)
-        print("RAW OCR TEXT START")
-        print("=" * 60)
-        print(raw_text)
-        print("=" * 60)
-        print("RAW OCR TEXT END")
-        print("=" * 60 + "\n")
+    # Segmentation is regex-heavy on the whole document; run it in a worker
+    # thread so other requests are not stalled behind it.
+    cases = await asyncio.to_thread(segment_cases, raw_text, selected_engine)
 
-        cases = segment_cases(raw_text,selected_engine)
-
-        # ── DEBUG: Print segmented cases to console ──
-        print(f"\n>>> CASES DETECTED: {len(cases)}")
+    # ── DEBUG: raw OCR text and segmented cases (only formatted at DEBUG) ──
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("RAW OCR TEXT START\n%s\nRAW OCR TEXT END", raw_text)
+        logger.debug("CASES DETECTED: %d", len(cases))
         for k, v in cases.items():
-            print(f"\n--- CASE {k} ---")
-            print(v[:200] + ("..." if len(v) > 200 else ""))
-        print()
-
-        elapsed = round(time.time() - start, 2)
-
-        # Rough page count – count form-feed characters or fall back to 1
-        pages = max(raw_text.count("\f") + 1, 1) if raw_text else 0
-
-        logger.info(
-            "Extracted %d cases in %.2fs using %s (%s)",
-            len(cases),
-            elapsed,
-            selected_engine,
-            file_hash[:12],
-        )
-
-        cache[cache_key] = {
-            "cases": cases,
-            "engine": selected_engine,
-            "pages": pages,
-            "raw_text": raw_text,
-        }
-        current_file_hash = cache_key
-
-        return UploadResponse(
-            total_cases_detected=len(cases),
-            pages_processed=pages,
-            extraction_time=elapsed,
-            engine_used=selected_engine,
-        )
-    finally:
-        os.unlink(tmp.name)
+            logger.debug(
+                "--- CASE %s ---\n%s", k, v[:200] + ("..." if len(v) > 200 else "")
+            )
+
+    elapsed = round(time.time() - start, 2)
+
+    # Rough page count – count form-feed characters or fall back to 1
+    pages = max(raw_text.count("\f") + 1, 1) if raw_text else 0
+
+    logger.info(
+        "Extracted %d cases in %.2fs using %s (%s)",
+        len(cases),
+        elapsed,
+        selected_engine,
+        file_hash[:12],
+    )
+
+    # Pickling and writing the entry is file I/O; keep it off the event loop
+    await asyncio.to_thread(cache.put, cache_key, {
+        "cases": cases,
+        "engine": selected_engine,
+        "pages": pages,
+        "raw_text": raw_text,
+    })
+
+    return UploadResponse(
+        total_cases_detected=len(cases),
+        pages_processed=pages,
+        extraction_time=elapsed,
+        engine_used=selected_engine,
+    )
 
 
 @app.get("/case", response_model=CaseResponse)
 async def get_case(sno: int):
     """Retrieve a single case block by serial number."""
-    if current_file_hash is None or current_file_hash not in cache:
+    # In memory once a document has been processed; after a restart the
+    # first call unpickles it from disk, so keep that off the event loop
+    cached = await asyncio.to_thread(cache.most_recent)
+    if cached is None:
         raise HTTPException(status_code=404, detail="No document has been processed yet.")
 
-    cases = cache[current_file_hash]["cases"]
+    cases = cached["cases"]
     key = str(sno)
 
     if key not in cases:
-        available = ", ".join(sorted(cases.keys(), key=lambda x: int(x)))
+        available = ", ".join(cases)  # already in serial order
         raise HTTPException(
             status_code=404,
             detail=f"No case found with serial number {sno}. Available: {available}",
@@ -170,23 +204,24 @@ async def get_case(sno: int):
 @app.get("/debug", response_class=PlainTextResponse)
 async def debug_raw_text():
     """Return the raw OCR text from the last processed document (for debugging)."""
-    if current_file_hash is None or current_file_hash not in cache:
+    cached = await asyncio.to_thread(cache.most_recent)
+    if cached is None:
         return "No document has been processed yet."
 
-    cached = cache[current_file_hash]
     raw = cached.get("raw_text", "No raw text stored.")
     cases = cached.get("cases", {})
 
-    sorted_keys = sorted(cases.keys(), key=lambda x: int(x))
-    output = f"=== ENGINE: {cached['engine']} ===\n"
-    output += f"=== CASES DETECTED: {len(cases)} ===\n"
-    output += f"=== CASE KEYS: {', '.join(sorted_keys)} ===\n\n"
-    output += "=== RAW OCR TEXT ===\n"
-    output += raw + "\n\n"
-    output += "=== SEGMENTED CASES ===\n"
-    for k in sorted_keys:
-        output += f"\n--- CASE {k} ---\n"
-        output += cases[k] + "\n"
-
-    return output
+    out = io.StringIO()
+    out.write(f"=== ENGINE: {cached['engine']} ===\n")
+    out.write(f"=== CASES DETECTED: {len(cases)} ===\n")
+    out.write(f"=== CASE KEYS: {', '.join(cases)} ===\n\n")
+    out.write("=== RAW OCR TEXT ===\n")
+    out.write(raw)
+    out.write("\n\n=== SEGMENTED CASES ===\n")
+    for k, v in cases.items():
+        out.write(f"\n--- CASE {k} ---\n")
+        out.write(v)
+        out.write("\n")
+
+    return out.getvalue()
 
@@ -1,38 +1,218 @@
 import os
 import asyncio
+import hashlib
 import random
+import tempfile
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import BinaryIO
+import diskcache
 import httpx
-from PyPDF2 import PdfReader
+import orjson
+from pypdf import PdfReader
 from .base import OCRExtractor
 
+API_VERSION = "2023-07-31"
+
+# Disk cache of per-batch page texts, keyed by (pdf hash, page range, API
+# version), so re-uploads skip pages Azure has already analysed.
+PAGE_CACHE_DIR = os.getenv(
+    "AZURE_PAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ocr_pages")
+)
+PAGE_CACHE_SIZE = int(os.getenv("AZURE_PAGE_CACHE_SIZE", str(10 << 30)))
+# PDFs larger than this bypass the page cache entirely
+PAGE_CACHE_MAX_PDF_BYTES = int(
+    os.getenv("AZURE_PAGE_CACHE_MAX_PDF_BYTES", str(256 << 20))
+)
+
+# Read size when hashing / streaming the PDF
+STREAM_CHUNK_SIZE = 1 << 20
+
+_page_cache: diskcache.Cache | None = None
+
+# One pooled HTTP/2 client shared by every extract() call, so keep-alive
+# connections to Azure (and their TLS handshakes) are reused across uploads.
+# Opened/closed by the app's startup/shutdown hooks; created lazily otherwise.
+_client: httpx.AsyncClient | None = None
+
+
+def _get_page_cache() -> diskcache.Cache:
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = diskcache.Cache(
+            PAGE_CACHE_DIR,
+            size_limit=PAGE_CACHE_SIZE,
+            eviction_policy="least-recently-used",
+        )
+    return _page_cache
+
+
+def open_client() -> httpx.AsyncClient:
+    """Create the shared Azure HTTP client if it does not exist yet."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(300.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared Azure HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class _PDFSource:
+    """
+    A PDF stream shared by concurrently running batches.
+
+    Each batch streams the whole PDF as its request body. Reads are
+    positional and serialised by a lock, so batches never disturb each
+    other's offsets and the PDF is never copied into one big buffer.
+    """
+
+    def __init__(self, pdf: BinaryIO):
+        self._pdf = pdf
+        self._lock = threading.Lock()
+        self.size = pdf.seek(0, os.SEEK_END)
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        with self._lock:
+            self._pdf.seek(offset)
+            return self._pdf.read(size)
+
+    def sha256(self) -> str:
+        h = hashlib.sha256()
+        offset = 0
+        while chunk := self.read_at(offset, STREAM_CHUNK_SIZE):
+            h.update(chunk)
+            offset += len(chunk)
+        return h.hexdigest()
+
+    async def iter_chunks(self):
+        """Yield the PDF in chunks for an httpx request body."""
+        offset = 0
+        while chunk := await asyncio.to_thread(self.read_at, offset, STREAM_CHUNK_SIZE):
+            offset += len(chunk)
+            yield chunk
+
+
+def _count_pages(pdf: BinaryIO) -> int:
+    """
+    Page count read from /Count on the root page tree, so only the xref and
+    catalog are parsed rather than every page object.
+    """
+    pdf.seek(0)
+    reader = PdfReader(pdf, strict=False)
+    try:
+        return int(reader.trailer["/Root"]["/Pages"]["/Count"])
+    except (KeyError, TypeError, ValueError):
+        return len(reader.pages)
+
+
+class _RateLimiter:
+    """Space calls to wait() at least 1/rate seconds apart; rate <= 0 disables."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+                now = self._next_slot
+            self._next_slot = now + self.interval
+
+
+def _parse_retry_after(value: str | None, fallback: float) -> float:
+    """
+    Parse a Retry-After header value into seconds.
+
+    Accepts both forms allowed by RFC 7231: delay-seconds ("5") and an
+    HTTP-date ("Wed, 21 Oct 2015 07:28:00 GMT"). Returns `fallback` when the
+    header is missing or unparseable.
+    """
+    if not value:
+        return fallback
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return fallback
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _retry_after_seconds(headers: httpx.Headers, fallback: float) -> float:
+    """
+    Wait time for a throttled response, taking the largest of all hints.
+
+    Besides Retry-After, Azure may send `retry-after-ms` / `x-ms-retry-after-ms`
+    (milliseconds) and per-limit `x-ms-ratelimit-*-retry-after` headers.
+    Honouring the longest one avoids being re-throttled immediately.
+    """
+    waits = []
+    if "retry-after" in headers:
+        waits.append(_parse_retry_after(headers["retry-after"], fallback))
+    for name in ("retry-after-ms", "x-ms-retry-after-ms"):
+        ms = _parse_retry_after(headers.get(name), -1.0)
+        if ms >= 0:
+            waits.append(ms / 1000)
+    for name, value in headers.items():
+        if name.startswith("x-ms-ratelimit-") and name.endswith("-retry-after"):
+            waits.append(_parse_retry_after(value, fallback))
+    return max(waits) if waits else fallback
+
 
 class AzureDocumentIntelligenceExtractor(OCRExtractor):
     """
     OCR extractor using Azure Document Intelligence (prebuilt-layout model).
 
     - Uses 2-page batching (F0 tier limit).
+    - Runs up to AZURE_CONCURRENCY batches at once (use 1 on the F0 tier).
     - Uses Azure reading-order `content` field.
     - Implements exponential backoff + jitter for 429 handling.
-    - Slower, but much more stable.
     """
 
     BATCH_SIZE = 2
     BASE_DELAY = 3
     MAX_BACKOFF = 30
+    # Poll interval when Azure sends no retry-after: 0.5s doubling up to 5s
+    POLL_MIN_DELAY = 0.5
+    POLL_MAX_DELAY = 5
 
     def __init__(self):
         self.endpoint = os.getenv("AZURE_ENDPOINT", "").rstrip("/")
         self.api_key = os.getenv("AZURE_API_KEY", "")
         if not self.endpoint or not self.api_key:
             raise ValueError("AZURE_ENDPOINT and AZURE_API_KEY must be set in .env")
+        # Max analyze operations in flight at once (set to 1 on the F0 tier)
+        self.concurrency = max(int(os.getenv("AZURE_CONCURRENCY", "4")), 1)
+        # Requests/sec cap shared by all batches and uploads (F0 allows 1)
+        self.limiter = _RateLimiter(float(os.getenv("AZURE_MAX_RPS", "0")))
 
-    async def extract(self, file_path: str, max_pages: int = 0) -> str:
+    async def extract(
+        self, pdf: BinaryIO, max_pages: int = 0, pdf_hash: str | None = None
+    ) -> str:
 
-        with open(file_path, "rb") as f:
-            pdf_bytes = f.read()
+        source = _PDFSource(pdf)
 
-        reader = PdfReader(file_path)
-        total_pages = len(reader.pages)
+        total_pages = _count_pages(pdf)
         last_page = min(max_pages, total_pages) if max_pages > 0 else total_pages
 
         print(f"PDF TOTAL PAGES: {total_pages}, PROCESSING UP TO: {last_page}")
@@ -42,127 +222,183 @@ class AzureDocumentIntelligenceExtractor(OCRExtractor):
             for start in range(1, last_page + 1, self.BATCH_SIZE)
         ]
 
-        print(f"AZURE BATCHES: {batches}")
-
-        page_texts = []
+        print(f"AZURE BATCHES: {batches} (concurrency {self.concurrency})")
 
         base_url = (
             f"{self.endpoint}/formrecognizer/documentModels/"
-            f"prebuilt-layout:analyze?api-version=2023-07-31"
+            f"prebuilt-layout:analyze?api-version={API_VERSION}"
+        )
+
+        # Oversize PDFs bypass the page cache (pdf_hash=None); otherwise reuse
+        # the caller's hash of the upload and only hash here without one
+        if source.size > PAGE_CACHE_MAX_PDF_BYTES:
+            pdf_hash = None
+        elif pdf_hash is None:
+            pdf_hash = await asyncio.to_thread(source.sha256)
+
+        sem = asyncio.Semaphore(self.concurrency)
+
+        # HTTP/2 multiplexes concurrent submits/polls over one connection
+        client = open_client()
+        batch_results = await asyncio.gather(*[
+            self._process_batch(
+                client, base_url, source, pdf_hash, batch_idx, s, e, sem
+            )
+            for batch_idx, (s, e) in enumerate(batches)
+        ])
+
+        # Slot pages by number so assembly is a single in-order pass
+        page_slots: list[str | None] = [None] * last_page
+        for batch in batch_results:
+            for page_num, text in batch:
+                if 1 <= page_num <= last_page:
+                    page_slots[page_num - 1] = text
+
+        print(f"\n>>> TOTAL PAGES EXTRACTED: {sum(t is not None for t in page_slots)}")
+
+        # One join over a generator; the output matches the old header/text
+        # list joined with "\n"
+        return "\n".join(
+            f"\n\n=== PAGE {page_num} ===\n\n{text}"
+            for page_num, text in enumerate(page_slots, start=1)
+            if text is not None
         )
 
+    async def _process_batch(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str,
+        source: _PDFSource,
+        pdf_hash: str | None,
+        batch_idx: int,
+        batch_start: int,
+        batch_end: int,
+        sem: asyncio.Semaphore,
+    ) -> list[tuple[int, str]]:
+        """Submit one page range for analysis and poll until it completes."""
+        cache_key = f"{pdf_hash}:{batch_start}-{batch_end}:{API_VERSION}"
+        if pdf_hash is not None:
+            # diskcache is SQLite + file I/O; keep it off the event loop
+            cached = await asyncio.to_thread(lambda: _get_page_cache().get(cache_key))
+            if cached is not None:
+                print(f"  ✓ Batch {batch_start}-{batch_end} served from page cache")
+                return cached
+
         headers = {
             "Ocp-Apim-Subscription-Key": self.api_key,
             "Content-Type": "application/pdf",
+            # Explicit length so httpx streams the body without chunked encoding
+            "Content-Length": str(source.size),
         }
 
-        async with httpx.AsyncClient(timeout=300) as client:
+        async with sem:
 
-            for batch_idx, (batch_start, batch_end) in enumerate(batches):
+            # Sequential (F0) mode keeps the original pacing between batches
+            if self.concurrency == 1 and batch_idx > 0:
+                delay = self.BASE_DELAY + random.uniform(0.5, 2)
+                print(f"    ⏳ Waiting {round(delay,2)}s before next batch...")
+                await asyncio.sleep(delay)
 
-                if batch_idx > 0:
-                    delay = self.BASE_DELAY + random.uniform(0.5, 2)
-                    print(f"    ⏳ Waiting {round(delay,2)}s before next batch...")
-                    await asyncio.sleep(delay)
+            batch_url = f"{base_url}&pages={batch_start}-{batch_end}"
+            print(f"  → Batch {batch_start}-{batch_end}")
 
-                batch_url = f"{base_url}&pages={batch_start}-{batch_end}"
-                print(f"  → Batch {batch_start}-{batch_end}")
+            # ---------- SUBMIT WITH RETRY ----------
+            submit_backoff = 3
 
-                # ---------- SUBMIT WITH RETRY ----------
-                submit_backoff = 3
+            while True:
+                await self.limiter.wait()
+                response = await client.post(
+                    batch_url, headers=headers, content=source.iter_chunks()
+                )
 
-                while True:
-                    response = await client.post(
-                        batch_url, headers=headers, content=pdf_bytes
+                if response.status_code == 429:
+                    wait_time = _retry_after_seconds(
+                        response.headers, min(submit_backoff, self.MAX_BACKOFF)
                     )
 
-                    if response.status_code == 429:
-                        retry_after = response.headers.get("Retry-After")
-                        wait_time = (
-                            int(retry_after)
-                            if retry_after
-                            else min(submit_backoff, self.MAX_BACKOFF)
-                        )
+                    wait_time += random.uniform(0.5, 2)
+                    print(f"    ⚠ 429 on submit, waiting {round(wait_time,2)}s...")
+                    await asyncio.sleep(wait_time)
 
-                        wait_time += random.uniform(0.5, 2)
-                        print(f"    ⚠ 429 on submit, waiting {round(wait_time,2)}s...")
-                        await asyncio.sleep(wait_time)
+                    submit_backoff *= 2
+                    continue
 
-                        submit_backoff *= 2
-                        continue
+                response.raise_for_status()
+                break
 
-                    response.raise_for_status()
-                    break
+            operation_url = response.headers["operation-location"]
 
-                operation_url = response.headers["operation-location"]
+            # ---------- POLL WITH BACKOFF ----------
+            poll_backoff = 2
+            poll_delay = self.POLL_MIN_DELAY
 
-                # ---------- POLL WITH BACKOFF ----------
-                poll_backoff = 2
+            while True:
+                await self.limiter.wait()
+                poll_response = await client.get(
+                    operation_url,
+                    headers={"Ocp-Apim-Subscription-Key": self.api_key},
+                )
 
-                while True:
-                    poll_response = await client.get(
-                        operation_url,
-                        headers={"Ocp-Apim-Subscription-Key": self.api_key},
+                if poll_response.status_code == 429:
+                    wait_time = _retry_after_seconds(
+                        poll_response.headers, min(poll_backoff, self.MAX_BACKOFF)
                     )
 
-                    if poll_response.status_code == 429:
-                        retry_after = poll_response.headers.get("Retry-After")
-                        wait_time = (
-                            int(retry_after)
-                            if retry_after
-                            else min(poll_backoff, self.MAX_BACKOFF)
-                        )
-
-                        wait_time += random.uniform(0.5, 2)
-                        print(f"    ⚠ 429 on poll, waiting {round(wait_time,2)}s...")
-                        await asyncio.sleep(wait_time)
-
-                        poll_backoff *= 2
-                        continue
+                    wait_time += random.uniform(0.5, 2)
+                    print(f"    ⚠ 429 on poll, waiting {round(wait_time,2)}s...")
+                    await asyncio.sleep(wait_time)
 
-                    poll_response.raise_for_status()
-                    result = poll_response.json()
-                    status = result.get("status", "")
+                    poll_backoff *= 2
+                    continue
 
-                    if status == "succeeded":
-                        ar = result["analyzeResult"]
-                        content = ar.get("content", "")
-                        batch_pages = ar.get("pages", [])
+                poll_response.raise_for_status()
+                # Layout results can be MB-scale; orjson parses them much faster
+                result = orjson.loads(poll_response.content)
+                status = result.get("status", "")
 
-                        print(
-                            f"    ✓ Got pages {[p.get('pageNumber') for p in batch_pages]}"
-                        )
+                if status == "succeeded":
+                    ar = result["analyzeResult"]
+                    content = ar.get("content", "")
+                    batch_pages = ar.get("pages", [])
 
-                        for page in batch_pages:
-                            page_num = page.get("pageNumber", 1)
-                            spans = page.get("spans", [])
+                    print(
+                        f"    ✓ Got pages {[p.get('pageNumber') for p in batch_pages]}"
+                    )
 
-                            if spans:
-                                start_off = spans[0]["offset"]
-                                end_off = start_off + spans[0]["length"]
-                                page_text = content[start_off:end_off]
-                            else:
-                                page_text = ""
+                    page_texts = []
+                    for page in batch_pages:
+                        page_num = page.get("pageNumber", 1)
+                        spans = page.get("spans", [])
 
-                            page_texts.append((page_num, page_text))
+                        if spans:
+                            start_off = spans[0]["offset"]
+                            end_off = start_off + spans[0]["length"]
+                            page_text = content[start_off:end_off]
+                        else:
+                            page_text = ""
 
-                        break
+                        page_texts.append((page_num, page_text))
 
-                    elif status == "failed":
-                        error = result.get("error", {})
-                        raise RuntimeError(
-                            f"Azure failed on pages {batch_start}-{batch_end}: "
-                            f"{error.get('message', 'Unknown error')}"
+                    # Never cache a batch that came back with missing pages
+                    if pdf_hash is not None and len(page_texts) == batch_end - batch_start + 1:
+                        await asyncio.to_thread(
+                            lambda: _get_page_cache().set(cache_key, page_texts)
                         )
 
-                    # Normal polling interval (slightly slower to avoid 429)
-                    await asyncio.sleep(2.5)
+                    return page_texts
 
-        print(f"\n>>> TOTAL PAGES EXTRACTED: {len(page_texts)}")
-
-        parts = []
-        for page_num, text in sorted(page_texts, key=lambda x: x[0]):
-            parts.append(f"\n\n=== PAGE {page_num} ===\n")
-            parts.append(text)
+                elif status == "failed":
+                    error = result.get("error", {})
+                    raise RuntimeError(
+                        f"Azure failed on pages {batch_start}-{batch_end}: "
+                        f"{error.get('message', 'Unknown error')}"
+                    )
 
-        return "\n".join(parts)
+                # Follow the service's retry-after hint (usually 1s when healthy),
+                # otherwise back off exponentially
+                retry_after = poll_response.headers.get("retry-after")
+                if retry_after:
+                    await asyncio.sleep(_parse_retry_after(retry_after, 1.0))
+                else:
+                    await asyncio.sleep(poll_delay)
+                    poll_delay = min(poll_delay * 2, self.POLL_MAX_DELAY)
@@ -1,20 +1,33 @@
 from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
 
 
 class OCRExtractor(ABC):
     """Abstract base class for OCR extractors."""
 
     @abstractmethod
-    async def extract(self, file_path: str, max_pages: int = 0) -> str:
+    async def extract(
+        self, pdf: BinaryIO, max_pages: int = 0, pdf_hash: Optional[str] = None
+    ) -> str:
         """
-        Extract text from a PDF file.
+        Extract text from a PDF.
 
         Args:
-            file_path: Path to the PDF file on disk.
+            pdf: Seekable binary stream holding the PDF (in memory, or
+                 spooled to disk for large uploads).
             max_pages: Maximum number of pages to process.
                        0 means process all pages.
+            pdf_hash: SHA-256 hex digest of the PDF, if the caller already
+                      computed it; extractors that cache by content use it
+                      instead of hashing the PDF again.
 
         Returns:
             Full raw text string in correct reading order.
         """
         ...
+
+    def warmup(self) -> None:
+        """
+        Optional: load models / run a dummy inference so the first real
+        request does not pay the start-up cost. No-op by default.
+        """
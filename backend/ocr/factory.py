@@ -3,11 +3,16 @@ from .azure_extractor import AzureDocumentIntelligenceExtractor
 from .paddle_extractor import PaddleOCRExtractor
 from .tesseract_extractor import TesseractExtractor
 
+# One long-lived instance per engine; constructing Paddle loads three models
+_INSTANCES: dict[str, OCRExtractor] = {}
+
 
 def get_extractor(engine_name: str) -> OCRExtractor:
     """
     Factory function to return the appropriate OCR extractor.
 
+    Instances are created on first use and reused for later requests.
+
     Args:
         engine_name: One of 'azure', 'paddle', 'tesseract'.
 
@@ -29,4 +34,6 @@ def get_extractor(engine_name: str) -> OCRExtractor:
             f"Supported engines: {', '.join(engines.keys())}"
         )
 
-    return engines[engine_name]()
+    if engine_name not in _INSTANCES:
+        _INSTANCES[engine_name] = engines[engine_name]()
+    return _INSTANCES[engine_name]
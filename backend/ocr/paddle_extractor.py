@@ -1,37 +1,73 @@
 import asyncio
+import logging
+import threading
+from typing import BinaryIO, Iterable, Optional
 import numpy as np
 import paddle
-from pdf2image import convert_from_path
 from paddleocr import PaddleOCR
 from .base import OCRExtractor
+from .text_layer import PAGE_END, extract_pages
+
+logger = logging.getLogger(__name__)
 
 
 class PaddleOCRExtractor(OCRExtractor):
     """
     OCR extractor using PaddleOCR.
 
-    Converts each PDF page to an image, runs PaddleOCR,
-    and combines all detected text in reading order.
+    Pages with an embedded text layer are read directly; the rest are
+    converted to images, run through PaddleOCR, and all detected text is
+    combined in reading order.
     """
 
+    # Text-line crops recognised per batch. PaddleOCR's ocr() cannot take a
+    # list of pages while detection is enabled, so batching happens here.
+    REC_BATCH_NUM = 16
+
+    # Grayscale pages carry 1 byte per pixel instead of 3; PaddleOCR
+    # expands 2-D input to BGR itself
+    DPI = 200
+
     def __init__(self):
-        # Initialize PaddleOCR once (downloads models on first run)
-        self.ocr = PaddleOCR(use_angle_cls=True, lang="en")
+        # Initialize PaddleOCR once (downloads models on first run).
+        # det/cls/rec run on the GPU only when Paddle was built with CUDA
+        # *and* this host actually has one; a CUDA wheel on a CPU-only
+        # machine would otherwise fail to create the GPU predictor.
+        use_gpu = (
+            paddle.device.is_compiled_with_cuda()
+            and paddle.device.cuda.device_count() > 0
+        )
+        logger.info("PaddleOCR running on %s", "GPU" if use_gpu else "CPU")
+        self.ocr = PaddleOCR(
+            use_angle_cls=True,
+            lang="en",
+            rec_batch_num=self.REC_BATCH_NUM,
+            use_gpu=use_gpu,
+        )
+        # The extractor is shared across requests; Paddle predictors are not
+        # safe to run from several threads at once
+        self._lock = threading.Lock()
 
-    async def extract(self, file_path: str, max_pages: int = 0) -> str:
+    def warmup(self) -> None:
+        # One tiny inference triggers Paddle's graph build outside a request
+        with self._lock:
+            self.ocr.ocr(np.zeros((64, 64, 3), dtype=np.uint8))
+
+    async def extract(
+        self, pdf: BinaryIO, max_pages: int = 0, pdf_hash: Optional[str] = None
+    ) -> str:
         # Run CPU-bound PDF conversion and OCR in a thread pool
-        return await asyncio.to_thread(self._extract_sync, file_path, max_pages)
+        return await asyncio.to_thread(self._extract_sync, pdf, max_pages)
 
-    def _extract_sync(self, file_path: str, max_pages: int = 0) -> str:
-        kwargs = {}
-        if max_pages > 0:
-            kwargs["last_page"] = max_pages
-        images = convert_from_path(file_path, **kwargs)
-        all_text: list[str] = []
+    def _extract_sync(self, pdf: BinaryIO, max_pages: int = 0) -> str:
+        return extract_pages(pdf, max_pages, self.DPI, self._ocr_pages)
 
+    def _ocr_pages(self, images: Iterable) -> list[str]:
+        ocr_texts: list[str] = []
         for page_image in images:
-            img_array = np.array(page_image)
-            result = self.ocr.ocr(img_array)
+            # asarray shares the image buffer where possible instead of copying
+            with self._lock:
+                result = self.ocr.ocr(np.asarray(page_image))
 
             page_lines: list[str] = []
             if result and result[0]:
@@ -39,6 +75,7 @@ class PaddleOCRExtractor(OCRExtractor):
                     text = line[1][0]  # (text, confidence)
                     page_lines.append(text)
 
-            all_text.append("\n".join(page_lines))
-
-        return "\n\n".join(all_text)
+            # End every page like Tesseract does, so /upload's page count
+            # is the same whether a page came from OCR or the text layer
+            ocr_texts.append("\n".join(page_lines) + PAGE_END)
+        return ocr_texts
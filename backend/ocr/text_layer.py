@@ -0,0 +1,118 @@
+"""
+Embedded text-layer fast path for born-digital PDFs.
+
+Pages whose text layer is dense enough are used as-is; only the remaining
+(scanned) pages need to be rasterised and OCR'd.
+"""
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Callable, Iterable, Iterator
+from pdf2image import convert_from_path
+from pypdf import PdfReader
+
+# Pages with fewer extractable characters than this are treated as scanned
+MIN_TEXT_CHARS = int(os.getenv("TEXT_LAYER_MIN_CHARS", "100"))
+
+# Every page ends with a form feed, as Tesseract's own page output does, so
+# /upload's "\f" page count is the same whichever engine or source (text
+# layer or OCR) a page came from
+PAGE_END = "\f"
+
+
+def read_text_layer(pdf: BinaryIO, max_pages: int = 0) -> list[str | None]:
+    """
+    Extract each page's embedded text, or None where the page needs OCR.
+
+    Returns an empty list when the PDF cannot be parsed, so callers OCR
+    every page as before.
+    """
+    pdf.seek(0)
+    try:
+        reader = PdfReader(pdf, strict=False)
+        n_pages = len(reader.pages)
+        if max_pages > 0:
+            n_pages = min(n_pages, max_pages)
+        texts: list[str | None] = []
+        for i in range(n_pages):
+            text = reader.pages[i].extract_text() or ""
+            texts.append(text if len(text.strip()) >= MIN_TEXT_CHARS else None)
+        return texts
+    except Exception:
+        return []
+
+
+def scanned_page_ranges(texts: list[str | None]) -> list[tuple[int, int]]:
+    """1-based inclusive (first, last) runs of pages with no usable text."""
+    ranges: list[tuple[int, int]] = []
+    for page_num, text in enumerate(texts, start=1):
+        if text is not None:
+            continue
+        if ranges and ranges[-1][1] == page_num - 1:
+            ranges[-1] = (ranges[-1][0], page_num)
+        else:
+            ranges.append((page_num, page_num))
+    return ranges
+
+
+def merge_ocr_pages(texts: list[str | None], ocr_texts: list[str]) -> list[str]:
+    """
+    Fill the None slots of `texts`, in page order, with OCR output; the
+    text-layer pages get PAGE_END appended.
+    """
+    ocr_iter = iter(ocr_texts)
+    return [t + PAGE_END if t is not None else next(ocr_iter, "") for t in texts]
+
+
+def rasterize(pdf_path: str, first_page: int, last_page: int, dpi: int) -> list:
+    """Render pages first_page..last_page (last_page 0 = to the end)."""
+    kwargs = {"first_page": first_page}
+    if last_page > 0:
+        kwargs["last_page"] = last_page
+    return convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        grayscale=True,
+        fmt="jpeg",
+        thread_count=os.cpu_count() or 1,
+        **kwargs,
+    )
+
+
+def extract_pages(
+    pdf: BinaryIO,
+    max_pages: int,
+    dpi: int,
+    ocr_pages: Callable[[Iterable], list[str]],
+) -> str:
+    """
+    Read a PDF's text, using the text layer where it is usable and OCR for
+    the rest, and join the pages with a blank line.
+
+    `ocr_pages` receives the rendered images of the scanned pages, lazily
+    and in page order, and returns one text per image.
+    """
+    # Born-digital pages skip rasterisation and OCR entirely
+    texts = read_text_layer(pdf, max_pages)
+    ranges = scanned_page_ranges(texts) if texts else [(1, max_pages)]
+
+    ocr_texts: list[str] = []
+    if ranges:
+        # pdftoppm reads from a file. convert_from_bytes would write the
+        # whole PDF to a fresh temp file on every call, i.e. once per range,
+        # so copy the stream to disk once and render every range from it.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, "input.pdf")
+            pdf.seek(0)
+            with open(pdf_path, "wb") as f:
+                shutil.copyfileobj(pdf, f)
+
+            def images() -> Iterator:
+                # One pdftoppm call per contiguous run of scanned pages
+                for first, last in ranges:
+                    yield from rasterize(pdf_path, first, last, dpi)
+
+            ocr_texts = ocr_pages(images())
+
+    all_text = merge_ocr_pages(texts, ocr_texts) if texts else ocr_texts
+    return "\n\n".join(all_text)
@@ -11,7 +11,12 @@ Tesseract pipeline (most complex — handles column-dump artifacts):
   3. segment_cases_tesseract()    — split on inline serial boundaries, stitch
                                     page-break orphans, merge connected sub-cases
 """
+import hashlib
 import re
+import threading
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from itertools import accumulate, islice
 from typing import Optional
 
 
@@ -19,6 +24,19 @@ from typing import Optional
 # TESSERACT — helpers
 # ════════════════════════════════════════════════════════════════════
 
+# Patterns are compiled once here; these helpers run per line, so calling
+# bound methods skips re's per-call cache lookup.
+_NOISE_RE = re.compile(r'^(\s*)(\d{1,3}(?:\.\d+)?)(\.)?\s+([=]?\s*)(.*)')
+_GENUINE_SERIAL_RE = re.compile(r'^(?!(?:IA|No\.)\s)\d{1,3}(?:\.\d+)?\s+\S')
+_STANDALONE_NUM_RE = re.compile(r'^\d{1,3}(?:\.\d+)?$')
+_LEADING_NUM_RE = re.compile(r'^(\d{1,3})')
+_TYPE_OPENER_LINE_RE = re.compile(r'^(?:C\.A\.|SLP\(|W\.P\.\(|Crl\.A\.|MA\s+\d|Diary\s+No\.)')
+_DIGITS_ONLY_LINE_RE = re.compile(r'^[\d\-/,]+$')
+_PARTY_LINE_RE = re.compile(r'^[A-Z][A-Z0-9\s\.,&/@\-()\'\"M/S]+$')
+_DOUBLE_NEWLINE_RE = re.compile(r'\n\n+')
+_VERSUS_SPLIT_RE = re.compile(r'\n[ \t]*Versus[ \t]*\n')
+
+
 def _normalize_ocr_noise(line: str) -> str:
     """
     Strip common Tesseract mis-reads on serial-number lines.
@@ -26,7 +44,7 @@ def _normalize_ocr_noise(line: str) -> str:
       '15. SLP(C) No. 11727/2020' → '15 SLP(C) No. 11727/2020'
     Normal lines are returned unchanged.
     """
-    m = re.match(r'^(\s*)(\d{1,3}(?:\.\d+)?)(\.)?\s+([=]?\s*)(.*)', line)
+    m = _NOISE_RE.match(line)
     return f"{m.group(1)}{m.group(2)} {m.group(5)}" if m else line
 
 
@@ -36,9 +54,7 @@ def _is_genuine_inline_serial(stripped: str) -> bool:
     Rejects 'IA No. …' and 'No. 2218/2023' fragments that start with a digit
     only because they follow 'in SLP(C)'.
     """
-    if not re.match(r'^\d{1,3}(?:\.\d+)?\s+\S', stripped):
-        return False
-    return not re.match(r'^(?:IA|No\.)\s', stripped)
+    return _GENUINE_SERIAL_RE.match(stripped) is not None
 
 
 def _infer_serials(prev_inline: Optional[int],
@@ -70,14 +86,20 @@ _CASE_TYPE_OPENER_RE = re.compile(
 _BENCH_CODE_RE = re.compile(r'^(?:[IVX]+-?[A-Z]?|[A-Z]{1,3}|Il|PIL-\w+)$')
 
 
-def _split_case_type_blocks(text: str) -> list:
-    """Split a content block on case-type openers → per-case sub-blocks."""
-    starts = [m.start() for m in _CASE_TYPE_OPENER_RE.finditer(text)]
-    if not starts:
-        return []
-    return [text[s:(starts[k+1] if k+1 < len(starts) else len(text))].strip()
-            for k, s in enumerate(starts)
-            if text[s:(starts[k+1] if k+1 < len(starts) else len(text))].strip()]
+def _split_case_type_blocks(text: str, starts: Optional[list] = None) -> list:
+    """
+    Split a content block on case-type openers → per-case sub-blocks.
+    `starts` may pass in the opener offsets when the caller already has them.
+    """
+    if starts is None:
+        starts = [m.start() for m in _CASE_TYPE_OPENER_RE.finditer(text)]
+    blocks = []
+    for k, s in enumerate(starts):
+        e = starts[k + 1] if k + 1 < len(starts) else len(text)
+        chunk = text[s:e].strip()
+        if chunk:
+            blocks.append(chunk)
+    return blocks
 
 
 def _find_party_start_in_block(block: str) -> int:
@@ -86,22 +108,17 @@ def _find_party_start_in_block(block: str) -> int:
     Skips: the case-type header line, the bench-code line, blank lines.
     """
     lines = block.split('\n')
-    pos, seen = 0, False
-    for line in lines:
+    # offsets[k] = char offset where lines[k] starts
+    offsets = list(accumulate((len(l) + 1 for l in lines), initial=0))
+    seen = False
+    for k, line in enumerate(lines):
         s = line.strip()
         if not s:
-            pos += len(line) + 1
             continue
-        if re.match(r'^(?:C\.A\.|SLP\(|W\.P\.\(|Crl\.A\.|MA\s+\d|Diary\s+No\.)', s):
+        if _TYPE_OPENER_LINE_RE.match(s):
             seen = True
-            pos += len(line) + 1
-            continue
-        if seen and (_BENCH_CODE_RE.match(s) or re.match(r'^[\d\-/,]+$', s)):
-            pos += len(line) + 1
-            continue
-        if seen:
-            return pos
-        pos += len(line) + 1
+        elif seen and not (_BENCH_CODE_RE.match(s) or _DIGITS_ONLY_LINE_RE.match(s)):
+            return offsets[k]
     return len(block)
 
 
@@ -111,18 +128,27 @@ _PARTY_SKIP = (
     'CLARIFICATION', 'STAY', 'RELIEF', 'APPLICATION', 'MODIFICATION',
     'No.', 'ADDL', 'LENGTHY', 'ADDITIONAL',
 )
+# One anchored alternation so the prefix test runs in a single regex match
+_PARTY_SKIP_RE = re.compile('|'.join(map(re.escape, _PARTY_SKIP)))
 
 
 def _looks_like_party(text: str) -> bool:
     """True when the first line of text looks like a party/litigant name."""
-    fl = text.strip().split('\n')[0].strip()
-    if not fl or not fl[0].isupper():
+    fl = text.strip().partition('\n')[0].strip()
+    # Cheapest rejections first; the full-line regex runs last
+    if len(fl) < 4 or not fl[0].isupper():
         return False
-    if any(fl.startswith(s) for s in _PARTY_SKIP):
+    if _PARTY_SKIP_RE.match(fl):
         return False
-    if not re.match(r'^[A-Z][A-Z0-9\s\.,&/@\-()\'\"M/S]+$', fl):
-        return False
-    return len(fl) >= 4
+    return _PARTY_LINE_RE.match(fl) is not None
+
+
+def _last_party_index(paras: list) -> Optional[int]:
+    """Index of the last paragraph that looks like a party name, or None."""
+    for i in range(len(paras) - 1, -1, -1):
+        if _looks_like_party(paras[i]):
+            return i
+    return None
 
 
 def _split_resp_frag(text: str) -> tuple:
@@ -130,14 +156,15 @@ def _split_resp_frag(text: str) -> tuple:
     Split a between-Versus fragment into (respondent_and_IAs, next_petitioner).
     When the last party name is at the START of the fragment (no preceding IAs),
     the whole fragment is the respondent and next_petitioner is empty.
+    `text` must already be stripped.
     """
-    paras = re.split(r'\n\n+', text.strip())
-    last = next((i for i in range(len(paras)-1, -1, -1) if _looks_like_party(paras[i])), None)
+    paras = _DOUBLE_NEWLINE_RE.split(text)
+    last = _last_party_index(paras)
     if last is None:
-        return text.strip(), ""
+        return text, ""
     if last > 0:
         return '\n\n'.join(paras[:last]).strip(), '\n\n'.join(paras[last:]).strip()
-    return text.strip(), ""   # party at position 0 → whole block = respondent
+    return text, ""   # party at position 0 → whole block = respondent
 
 
 def _split_frag0(text: str) -> tuple:
@@ -145,11 +172,12 @@ def _split_frag0(text: str) -> tuple:
     Split fragment[0] (before the first Versus) into:
       (inline_respondent_for_prev_case,  petitioner_for_first_dump_case)
     If only one party name is present it IS the first petitioner (no inline resp).
+    `text` must already be stripped.
     """
-    paras = re.split(r'\n\n+', text.strip())
-    last = next((i for i in range(len(paras)-1, -1, -1) if _looks_like_party(paras[i])), None)
+    paras = _DOUBLE_NEWLINE_RE.split(text)
+    last = _last_party_index(paras)
     if last is None or last == 0:
-        return "", text.strip()
+        return "", text
     return '\n\n'.join(paras[:last]).strip(), '\n\n'.join(paras[last:]).strip()
 
 
@@ -170,17 +198,21 @@ def _distribute_parties(case_blocks: list, serials: list, party_content: str) ->
     Returns (inline_respondent, [party_block_per_case]).
     inline_respondent is appended to the preceding inline case by the caller.
     """
-    frags = re.compile(r'\n[ \t]*Versus[ \t]*\n').split(party_content)
+    frags = _VERSUS_SPLIT_RE.split(party_content)
     n = len(case_blocks)
     if len(frags) < 2:
         return "", [party_content] + [""] * (n - 1)
 
-    frag0_resp, case0_pet = _split_frag0(frags[0])
+    # splits[k] = (text closing the previous case, petitioner opening case k).
+    # Every fragment is split exactly once; only those the loop reads are.
+    # Fragments are stripped once here rather than repeatedly in the helpers.
+    splits = ([_split_frag0(frags[0].strip())]
+              + [_split_resp_frag(f.strip()) for f in frags[1:n + 1]])
 
     blocks = []
     for i in range(n):
-        pet = case0_pet if i == 0 else _split_resp_frag(frags[i])[1]
-        resp = _split_resp_frag(frags[i + 1])[0] if i + 1 < len(frags) else ""
+        pet = splits[i][1]
+        resp = splits[i + 1][0] if i + 1 < len(splits) else ""
         if pet and resp:
             blocks.append(f"{pet}\nVersus\n{resp}")
         elif pet:
@@ -190,14 +222,14 @@ def _distribute_parties(case_blocks: list, serials: list, party_content: str) ->
         else:
             blocks.append("")
 
-    return frag0_resp, blocks
+    return splits[0][0], blocks
 
 
 # ════════════════════════════════════════════════════════════════════
 # TESSERACT — column-dump reassembler
 # ════════════════════════════════════════════════════════════════════
 
-def _reassemble_column_dumps(text: str) -> str:
+def _reassemble_column_dumps(lines: list[str]) -> list[str]:
     """
     Fix Tesseract --psm 4 column-dump artefacts:
 
@@ -224,18 +256,44 @@ def _reassemble_column_dumps(text: str) -> str:
       5. Distributes party block across cases using Versus as a delimiter.
       6. Emits fully reconstructed inline-style lines.
     """
-    text = '\n'.join(_normalize_ocr_noise(l) for l in text.split('\n'))
-    lines = text.split('\n')
+    # Normalise every line up front (normalising never introduces a '\n')
+    lines = [_normalize_ocr_noise(l) for l in lines]
+    n = len(lines)
+
+    # ── classify every line once ──────────────────────────────────────────────
+    # Rejected zones fall through one line at a time, so rescanning lines per
+    # zone start made long runs of standalone numbers quadratic. Instead:
+    #   run_end[k]     first index >= k that is neither standalone nor blank
+    #   n_standalone   prefix counts of standalone-number lines
+    #   next_inline[k] first index >= k holding a genuine inline serial
+    stripped_lines = [l.strip() for l in lines]
+    is_inline = [_is_genuine_inline_serial(s) for s in stripped_lines]
+    standalone_match = _STANDALONE_NUM_RE.match
+    is_standalone = [bool(s) and standalone_match(s) is not None
+                     for s in stripped_lines]
+
+    run_end = [n] * (n + 1)
+    next_inline = [n] * (n + 1)
+    for k in range(n - 1, -1, -1):
+        run_end[k] = run_end[k + 1] if is_standalone[k] or not stripped_lines[k] else k
+        next_inline[k] = k if is_inline[k] else next_inline[k + 1]
+
+    n_standalone = [0] * (n + 1)
+    for k in range(n):
+        n_standalone[k + 1] = n_standalone[k] + is_standalone[k]
+
     output: list = []
     i = 0
     last_inline: Optional[int] = None
+    # Content window already found to hold no case-type blocks
+    empty_window: Optional[int] = None
 
-    while i < len(lines):
-        stripped = lines[i].strip()
+    while i < n:
+        stripped = stripped_lines[i]
 
         # ── normal inline serial line ─────────────────────────────────────────
-        if _is_genuine_inline_serial(stripped):
-            m = re.match(r'^(\d{1,3})', stripped)
+        if is_inline[i]:
+            m = _LEADING_NUM_RE.match(stripped)
             if m:
                 last_inline = int(m.group(1))
             output.append(lines[i])
@@ -243,33 +301,26 @@ def _reassemble_column_dumps(text: str) -> str:
             continue
 
         # ── detect start of standalone-serial dump zone ───────────────────────
-        if re.match(r'^\d{1,3}(?:\.\d+)?$', stripped) and stripped:
-            j = i
-            standalones: list = []
-            while j < len(lines):
-                s = lines[j].strip()
-                if re.match(r'^\d{1,3}(?:\.\d+)?$', s) and s:
-                    standalones.append(s)
-                    j += 1
-                elif s == '':
-                    j += 1
-                else:
-                    break
+        if is_standalone[i]:
+            j = run_end[i]
 
-            if len(standalones) < 2:          # single number — not a dump
+            # single number — not a dump; the window after this run is shared
+            # by every start inside it, so an empty one is only checked once
+            if n_standalone[j] - n_standalone[i] < 2 or j == empty_window:
                 output.append(lines[i])
                 i += 1
                 continue
 
+            standalones = [stripped_lines[k] for k in range(i, j) if is_standalone[k]]
+
             # Find end of content window (where the next inline serial begins)
-            nxt = next(
-                (k for k in range(j, len(lines)) if _is_genuine_inline_serial(lines[k].strip())),
-                len(lines)
-            )
+            nxt = next_inline[j]
             content = '\n'.join(lines[j:nxt])
-            case_blocks = _split_case_type_blocks(content)
+            type_starts = [m.start() for m in _CASE_TYPE_OPENER_RE.finditer(content)]
+            case_blocks = _split_case_type_blocks(content, type_starts)
 
             if not case_blocks:
+                empty_window = j
                 output.append(lines[i])
                 i += 1
                 continue
@@ -277,7 +328,6 @@ def _reassemble_column_dumps(text: str) -> str:
             full_serials = _infer_serials(last_inline, standalones, len(case_blocks))
 
             # ── separate case-type content from party content ─────────────────
-            type_starts = [m.start() for m in _CASE_TYPE_OPENER_RE.finditer(content)]
             if type_starts:
                 last_type_start = type_starts[-1]
                 last_block_text = content[last_type_start:]
@@ -318,7 +368,7 @@ def _reassemble_column_dumps(text: str) -> str:
         output.append(lines[i])
         i += 1
 
-    return '\n'.join(output)
+    return output
 
 
 # ════════════════════════════════════════════════════════════════════
@@ -328,8 +378,13 @@ def _reassemble_column_dumps(text: str) -> str:
 _TESSERACT_LEADING_RE = re.compile(
     r'^(?P<main>\d{1,3})(?:\.(?P<sub>\d+))?\s+(?!(?:No\.|no\.|NO\.))'
 )
-_TESSERACT_SPLIT_RE = re.compile(
-    r'(?=(?:^|\n)\s*\d{1,3}(?:\.\d+)?\s+(?!No\.|no\.|NO\.)[A-Z({\[])',
+# Leading whitespace is matched within a line only ([^\S\n]*), so each line
+# start is scanned once instead of every position in a blank run re-scanning
+# to its end. Blocks are stripped afterwards, so results are unchanged.
+# The serial is captured inside the lookahead so blocks need no re-parse.
+_TESSERACT_BLOCK_RE = re.compile(
+    r'(?=(?:^|\n)[^\S\n]*(?P<main>\d{1,3})(?:\.(?P<sub>\d+))?'
+    r'\s+(?!No\.|no\.|NO\.)[A-Z({\[])',
     re.MULTILINE,
 )
 
@@ -341,6 +396,31 @@ def _tesseract_parse_serial(block: str) -> Optional[tuple]:
     return int(m.group("main")), (int(m.group("sub")) if m.group("sub") else None)
 
 
+def _iter_serial_blocks(text: str):
+    """
+    Split text on inline-serial boundaries in one finditer pass.
+
+    Yields (main, sub, block) per stripped, non-empty block; main and sub are
+    None for blocks without a leading serial. Serials come from the boundary
+    match, so only the text before the first boundary is parsed separately.
+    """
+    matches = _TESSERACT_BLOCK_RE.finditer(text)
+    m = next(matches, None)
+
+    head = text[:m.start() if m else len(text)].strip()
+    if head:
+        parsed = _tesseract_parse_serial(head)
+        yield (*parsed, head) if parsed else (None, None, head)
+
+    while m is not None:
+        nxt = next(matches, None)
+        block = text[m.start():nxt.start() if nxt else len(text)].strip()
+        if block:
+            sub = m.group("sub")
+            yield int(m.group("main")), (int(sub) if sub else None), block
+        m = nxt
+
+
 def segment_cases_tesseract(text: str) -> dict:
     """
     Parse raw Tesseract OCR into {serial_key: full_case_text}.
@@ -363,65 +443,71 @@ def segment_cases_tesseract(text: str) -> dict:
         The actual case-34 party content is absent from this OCR pass.
       Re-running with --psm 6 eliminates these issues at source.
     """
-    text = _reassemble_column_dumps(text)
+    # Split into lines once here and join once for the serial-boundary split
+    text = '\n'.join(_reassemble_column_dumps(text.split('\n')))
 
-    cases: dict = {}
+    # Chunks per key, joined once at the end (repeated += is quadratic)
+    parts: defaultdict[str, list[str]] = defaultdict(list)
     last_key: Optional[str] = None
 
-    for block in _TESSERACT_SPLIT_RE.split(text):
-        block = block.strip()
-        if not block:
-            continue
-        parsed = _tesseract_parse_serial(block)
-        if parsed is None:
+    for main, sub, block in _iter_serial_blocks(text):
+        if main is None:
             if last_key:
-                cases[last_key] += "\n\n" + block
+                parts[last_key] += ("\n\n", block)
             continue
-        main, sub = parsed
         key = str(main)
         if sub is not None:
-            cases[key] = cases.get(key, '') + f"\n\n--- Connected {main}.{sub} ---\n{block}"
+            parts[key].append(f"\n\n--- Connected {main}.{sub} ---\n{block}")
         else:
-            cases[key] = cases.get(key, '') + ("\n\n" if key in cases else "") + block
+            if key in parts:
+                parts[key].append("\n\n")
+            parts[key].append(block)
         last_key = key
 
-    return cases
+    return {k: ''.join(v) for k, v in parts.items()}
 
 
 # ================================
 # AZURE SEGMENTATION
 # ================================
 
-def _azure_tag_line(line: str) -> str:
+_PAGE_MARKER_RE = re.compile(r'=== PAGE \d+ ===')
+# Line tags for the Azure tagger as one anchored alternation, tried in
+# priority order; the tag is the name of the alternative that matched.
+# ADVOCATE may appear anywhere in the line, hence the lookahead.
+_TAG_RE = re.compile(
+    r'(?P<VERSUS>Versus\b)'
+    r'|(?P<IA>IA (?:No\.|FOR )'
+    r'|FOR (?:EXEMPTION|ADMISSION|CONDONATION|PERMISSION|GRANT|'
+    r'APPLICATION|MODIFICATION|STAY|CLARIFICATION|APPROPRIATE|I\.R\.)'
+    r'|I\.R\.)'
+    r'|(?P<ADVOCATE>(?=.*\[(?:R|P|CAVEAT)-))'
+    r'|(?P<STRUCTURAL>---'
+    r'|\d{1,3}(?:\.\d+)?\s+'
+    r'|C\.A\.|SLP\(|W\.P\.\(|Crl\.A\.|MA\s+\d|Diary\s+No\.)'
+)
+_VERSUS_INLINE_RE = re.compile(r'^Versus\s+(.+)')
+_VERSUS_WORD_RE = re.compile(r'\bVersus\b')
+
+
+def stream_pages(text: str):
     """
-    Classify a single line for blob-splitting purposes.
+    Yield the text between '=== PAGE N ===' markers inserted by the Azure
+    extractor, in order, without the newlines around each marker.
 
-    VERSUS   — line begins with 'Versus'
-    IA       — IA/FOR application line or I.R. notation
-    ADVOCATE — contains [R-N] / [P-N] / [CAVEAT] bracket notation
-    EMPTY    — blank line
-    PARTY    — everything else (party name, court remark, …)
+    Pieces are yielded even when empty, so '\n'.join(stream_pages(text))
+    gives the marker-free text with one newline per marker.
     """
-    s = line.strip()
-    if not s:
-        return 'EMPTY'
-    if re.match(r'^Versus\b', s):
-        return 'VERSUS'
-    if (re.match(r'^IA (?:No\.|FOR )', s) or
-            re.match(
-                r'^FOR (?:EXEMPTION|ADMISSION|CONDONATION|PERMISSION|'
-                r'GRANT|APPLICATION|MODIFICATION|STAY|CLARIFICATION|'
-                r'APPROPRIATE|I\.R\.)',
-                s,
-            ) or
-            re.match(r'^I\.R\.', s)):
-        return 'IA'
-    if re.search(r'\[(?:R|P|CAVEAT)-', s):
-        return 'ADVOCATE'
-    return 'PARTY'
-
-
-def _azure_split_blob(blob: str) -> list[str]:
+    start = 0
+    for m in _PAGE_MARKER_RE.finditer(text):
+        yield text[start:m.start()].rstrip('\n')
+        start = m.end()
+        while start < len(text) and text[start] == '\n':
+            start += 1
+    yield text[start:]
+
+
+def _azure_split_blob(lines: list[str], struct_tags: list[str]) -> list[str]:
     """
     Split a content blob containing multiple merged case entries into one
     block per Petitioner/Versus/Respondent unit.
@@ -438,19 +524,22 @@ def _azure_split_blob(blob: str) -> list[str]:
 
     block[0] contains content that belongs to the blob-owner case.
     blocks[1..] contain content for the stub cases that precede the owner.
+
+    `struct_tags` are the _azure_tag_for_struct() tags of `lines`, already
+    computed for blob-start detection; STRUCTURAL lines count as PARTY here.
     """
-    lines = blob.split('\n')
     n = len(lines)
-    tags = [_azure_tag_line(l) for l in lines]
+    tags = ['PARTY' if t == 'STRUCTURAL' else t for t in struct_tags]
 
     def versus_is_inline(i: int) -> bool:
         s = lines[i].strip()
-        m = re.match(r'^Versus\s+(.+)', s)
+        m = _VERSUS_INLINE_RE.match(s)
         return bool(m and m.group(1).strip())
 
     versus_positions = [i for i, t in enumerate(tags) if t == 'VERSUS']
     if not versus_positions:
-        return [blob.strip()] if blob.strip() else []
+        blob = '\n'.join(lines).strip()
+        return [blob] if blob else []
 
     pet_starts: list[int] = []
 
@@ -499,40 +588,32 @@ def _azure_split_blob(blob: str) -> list[str]:
     return blocks
 
 
-_STRUCTURAL_LINE_RE = re.compile(
-    r'^(?:'
-    r'---\s*Connected'
-    r'|\d{1,3}(?:\.\d+)?\s+'
-    r'|(?:C\.A\.|SLP\(|W\.P\.\(|Crl\.A\.|MA\s+\d|Diary\s+No\.)'
-    r')'
-)
-
-
+# Blank/Versus/IA lines recur throughout a document, so tags are cached per
+# line string.
+@lru_cache(maxsize=8192)
 def _azure_tag_for_struct(line: str) -> str:
-    """Tag a line for blob-start detection purposes."""
+    """
+    Classify a single line for blob-start detection and blob splitting.
+
+    VERSUS     — line begins with 'Versus'
+    IA         — IA/FOR application line or I.R. notation
+    ADVOCATE   — contains [R-N] / [P-N] / [CAVEAT] bracket notation
+    STRUCTURAL — serial, case-type or '--- Connected' header line
+    EMPTY      — blank line
+    PARTY      — everything else (party name, court remark, …)
+    """
     s = line.strip()
     if not s:
         return 'EMPTY'
-    if re.match(r'^Versus\b', s):
-        return 'VERSUS'
-    if (re.match(r'^IA (?:No\.|FOR )', s) or
-            re.match(
-                r'^FOR (?:EXEMPTION|ADMISSION|CONDONATION|PERMISSION|GRANT|'
-                r'APPLICATION|MODIFICATION|STAY|CLARIFICATION|APPROPRIATE|I\.R\.)',
-                s,
-            ) or re.match(r'^I\.R\.', s)):
-        return 'IA'
-    if re.search(r'\[(?:R|P|CAVEAT)-', s):
-        return 'ADVOCATE'
-    if _STRUCTURAL_LINE_RE.match(s) or s.startswith('---'):
-        return 'STRUCTURAL'
-    return 'PARTY'
-
-
-def _azure_find_blob_start(text: str) -> int:
-    """
-    Find the character index where the redistributable blob begins inside
-    a blob-owner's full text.
+    m = _TAG_RE.match(s)
+    return m.lastgroup if m else 'PARTY'
+
+
+def _azure_find_blob_start(tags: list[str]) -> int:
+    """
+    Find the line index where the redistributable blob begins inside
+    a blob-owner's full text, given the _azure_tag_for_struct() tag of
+    each of its lines.
 
     Two things can precede the blob:
 
@@ -548,14 +629,12 @@ def _azure_find_blob_start(text: str) -> int:
 
     Returns max(A, B) so both patterns are handled correctly.
     """
-    lines = text.split('\n')
-    n = len(lines)
-    tags = [_azure_tag_for_struct(l) for l in lines]
+    n = len(tags)
 
     # ── A: walk back from first Versus ───────────────────────────────────────
     first_versus = next((i for i, t in enumerate(tags) if t == 'VERSUS'), None)
     if first_versus is None:
-        return len(text)
+        return n
 
     pet_a = first_versus - 1
     while pet_a >= 0:
@@ -572,8 +651,6 @@ def _azure_find_blob_start(text: str) -> int:
     else:
         pet_a = 0
 
-    pos_a = sum(len(l) + 1 for l in lines[:pet_a])
-
     # ── B: scan forward past structural section, skip ADVOCATE/IA preamble ──
     struct_end = 0
     i = 0
@@ -595,10 +672,26 @@ def _azure_find_blob_start(text: str) -> int:
         else:
             break
 
-    pos_b = (sum(len(l) + 1 for l in lines[:preamble_end + 1])
-             if preamble_end > struct_end else 0)
+    pet_b = preamble_end + 1 if preamble_end > struct_end else 0
 
-    return max(pos_a, pos_b)
+    return max(pet_a, pet_b)
+
+
+def _split_on_connected(text: str) -> list[str]:
+    """
+    Split text before each '\n--- Connected ' marker, like re.split on
+    (?=\n--- Connected ), but with str.find since the delimiter is literal.
+    """
+    marker = '\n--- Connected '
+    sections: list[str] = []
+    prev = 0
+    idx = text.find(marker)
+    while idx != -1:
+        sections.append(text[prev:idx])
+        prev = idx
+        idx = text.find(marker, idx + 1)
+    sections.append(text[prev:])
+    return sections
 
 
 def _azure_redistribute_blobs(cases: dict[str, str]) -> dict[str, str]:
@@ -623,27 +716,30 @@ def _azure_redistribute_blobs(cases: dict[str, str]) -> dict[str, str]:
       5. Append blocks[N..] back to B's blob-carrying section.
          B retains its structural header + any excess blocks.
     """
-    def count_versus(text: str) -> int:
-        return len(re.findall(r'\bVersus\b', text))
-
-    def is_stub(key: str) -> bool:
-        return count_versus(result[key]) == 0
+    def has_versus(text: str, n: int = 1) -> bool:
+        """True when text has at least n whole-word 'Versus'; stops at the nth."""
+        if 'Versus' not in text:   # C substring scan rejects most texts
+            return False
+        return next(islice(_VERSUS_WORD_RE.finditer(text), n - 1, None), None) is not None
 
     all_keys = sorted(cases.keys(), key=lambda k: float(k))
     result = dict(cases)
 
+    # Stub flags are computed once up front. A pass only rewrites its stub run
+    # and blob owner, then resumes after the owner, so the texts of keys still
+    # to be examined never change and the flags stay valid.
+    stub = [not has_versus(cases[k]) for k in all_keys]
+
     i = 0
     while i < len(all_keys):
-        key = all_keys[i]
-
-        if not is_stub(key):
+        if not stub[i]:
             i += 1
             continue
 
         # Collect the run of consecutive stubs
         stub_run: list[str] = []
         j = i
-        while j < len(all_keys) and is_stub(all_keys[j]):
+        while j < len(all_keys) and stub[j]:
             stub_run.append(all_keys[j])
             j += 1
 
@@ -657,14 +753,13 @@ def _azure_redistribute_blobs(cases: dict[str, str]) -> dict[str, str]:
         # ── Determine which section of the blob owner actually carries the blob ──
         # Split on '--- Connected N.M ---' markers to get sections.
         # The last section with ≥ 2 Versus is the blob carrier.
-        connected_split_re = re.compile(r'(?=\n--- Connected )')
-        sections = connected_split_re.split(blob_owner_text)
+        sections = _split_on_connected(blob_owner_text)
         # sections[0] = parent content, sections[1..] = Connected sub-sections
 
         # Find the last section that has ≥ 2 Versus (the blob carrier)
         blob_section_idx = None
         for si in range(len(sections) - 1, -1, -1):
-            if count_versus(sections[si]) >= 2:
+            if has_versus(sections[si], 2):
                 blob_section_idx = si
                 break
 
@@ -675,12 +770,16 @@ def _azure_redistribute_blobs(cases: dict[str, str]) -> dict[str, str]:
 
         blob_section_text = sections[blob_section_idx]
 
-        # Find the blob start within this section
-        blob_start = _azure_find_blob_start(blob_section_text)
-        structural_header = blob_section_text[:blob_start].rstrip()
-        blob = blob_section_text[blob_start:]
+        # Find the blob start within this section; both helpers share one
+        # split of the section into lines and one tagging pass over them
+        section_lines = blob_section_text.split('\n')
+        section_tags = [_azure_tag_for_struct(l) for l in section_lines]
+        blob_start = _azure_find_blob_start(section_tags)
+        structural_header = '\n'.join(section_lines[:blob_start]).rstrip()
 
-        blob_blocks = _azure_split_blob(blob)
+        blob_blocks = _azure_split_blob(
+            section_lines[blob_start:], section_tags[blob_start:]
+        )
         if not blob_blocks:
             i = j + 1
             continue
@@ -736,59 +835,52 @@ def segment_cases_azure(text: str) -> dict[str, str]:
     Connected cases (e.g. 4.1, 5.8) are merged under their parent key.
     """
     # Strip page markers inserted by the extractor (=== PAGE N ===)
-    text = re.sub(r'\n*=== PAGE \d+ ===\n*', '\n', text)
-
-    # Split on inline serial boundaries (same regex as Tesseract)
-    raw_blocks: list[str] = _TESSERACT_SPLIT_RE.split(text)
+    text = '\n'.join(stream_pages(text))
 
-    # Classify each block
-    classified: list[tuple[Optional[int], Optional[int], str]] = []
-    for block in raw_blocks:
-        block = block.strip()
-        if not block:
-            continue
-        parsed = _tesseract_parse_serial(block)
-        if parsed is None:
-            classified.append((None, None, block))
-        else:
-            classified.append((parsed[0], parsed[1], block))
+    # Split on inline serial boundaries (same regex as Tesseract) and
+    # classify each block by its serial
+    classified = _iter_serial_blocks(text)
 
     # Stitch orphans + merge sub-cases.
     # Key fix: when a parent block arrives after its sub-cases have already
     # initialised the key, prepend the parent content so that party/Versus
     # data always sits at the top — where _azure_find_blob_start and
     # _azure_split_blob expect it.
-    cases: dict[str, str] = {}
+    # Chunks per key, joined once at the end (repeated += is quadratic).
+    parts: dict[str, list[str]] = {}
     last_key: Optional[str] = None
 
     for main, sub, blk in classified:
         if main is None:
             if last_key:
-                cases[last_key] += "\n\n" + blk
+                parts[last_key] += ("\n\n", blk)
             continue
 
         key = str(main)
 
         if sub is not None:
-            if key in cases:
-                cases[key] += f"\n\n--- Connected {main}.{sub} ---\n{blk}"
+            if key in parts:
+                parts[key].append(f"\n\n--- Connected {main}.{sub} ---\n{blk}")
             else:
                 # Sub-case arrived before its parent — initialise with a
                 # Connected marker so the parent can detect this later.
-                cases[key] = f"--- Connected {main}.{sub} ---\n{blk}"
+                parts[key] = [f"--- Connected {main}.{sub} ---\n{blk}"]
             last_key = key
         else:
-            if key in cases:
+            if key in parts:
                 # Parent block arriving after sub-cases have already seeded
                 # the key: prepend so party content is always at the top.
-                if cases[key].startswith("--- Connected"):
-                    cases[key] = blk + "\n\n" + cases[key]
+                # (A key's first chunk is either a parent block or a marker.)
+                if parts[key][0].startswith("--- Connected"):
+                    parts[key][:0] = (blk, "\n\n")
                 else:
-                    cases[key] += "\n\n" + blk
+                    parts[key] += ("\n\n", blk)
             else:
-                cases[key] = blk
+                parts[key] = [blk]
             last_key = key
 
+    cases = {k: ''.join(v) for k, v in parts.items()}
+
     # Redistribute multi-case blobs from blob owners back to stub cases
     cases = _azure_redistribute_blobs(cases)
 
@@ -799,75 +891,124 @@ def segment_cases_azure(text: str) -> dict[str, str]:
 # PADDLE SEGMENTATION (ROBUST)
 # ================================
 
-SERIAL_PATTERN = re.compile(
-    r'^\s*(\d+(?:\.\d+)?)(?:\s*$|\s*Connected\b)',
+# Serial lines and case-type lines in one alternation, so the text is
+# scanned once; m.lastgroup tells which one matched. The shared ^ sits
+# outside the alternation so the engine skips straight to line starts, and
+# serial whitespace is [^\S\n] (whitespace other than newline) so it never
+# runs across blank lines and each line start is tried once.
+CASE_TOKEN_PATTERN = re.compile(
+    r'^(?:'
+    r'(?P<serial>[^\S\n]*(?P<num>\d+(?:\.\d+)?)(?:[^\S\n]*$|[^\S\n]*Connected\b))'
+    r'|(?P<ctype>C\.A\. No\.|SLP\(C\) No\.|MA\s+\d+/\d+|Diary No\.)'
+    r')',
     re.MULTILINE,
 )
 
-CASE_TYPE_PATTERN = re.compile(
-    r'^(C\.A\. No\.|SLP\(C\) No\.|MA\s+\d+/\d+|Diary No\.)',
-    re.MULTILINE
-)
-
 
 def segment_cases_paddle(text: str) -> dict[str, str]:
     """
     Segment cases from Paddle OCR output.
     Handles normal serial numbers, connected cases, and layout drift.
     """
-    matches = list(SERIAL_PATTERN.finditer(text))
-    if not matches:
-        return {}
-
-    cases = {}
-    for i, match in enumerate(matches):
-        serial = match.group(1)
-        start = match.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        block = text[start:end].strip()
+    cases: dict[str, str] = {}
+    # Chunks for cases with appended Connected sub-cases, joined once at the
+    # end (repeated += is quadratic); most cases never get an entry here
+    connected: dict[str, list[str]] = {}
+    # Offset of each case's last case-type line, relative to cases[key]
+    last_types: dict[str, Optional[int]] = {}
+    # Length of each case's own text, before any appended Connected sub-cases
+    parent_ends: dict[str, int] = {}
+
+    def emit(match: re.Match, end: int, ctype: Optional[int]) -> None:
+        serial = match.group("num")
+        # Only spaces or tabs precede the number on a serial line, so the
+        # stripped block starts at the number: slice from there, rstrip only
+        start = match.start("num")
+        block = text[start:end].rstrip()
+        if ctype is not None:
+            ctype -= start
 
         if "." in serial:
             parent_serial = serial.split(".")[0]
             if parent_serial in cases:
-                cases[parent_serial] += f"\n\n--- Connected Case {serial} ---\n{block}"
+                chunk = f"\n\n--- Connected Case {serial} ---\n{block}"
+                if parent_serial in connected:
+                    connected[parent_serial].append(chunk)
+                else:
+                    connected[parent_serial] = [cases[parent_serial], chunk]
             else:
-                cases[parent_serial] = f"--- Connected Case {serial} ---\n{block}"
+                header = f"--- Connected Case {serial} ---\n"
+                cases[parent_serial] = header + block
+                last_types[parent_serial] = (
+                    None if ctype is None else len(header) + ctype
+                )
+                parent_ends[parent_serial] = len(header) + len(block)
         else:
+            # A repeated serial replaces the earlier case outright
             cases[serial] = block
+            connected.pop(serial, None)
+            last_types[serial] = ctype
+            parent_ends[serial] = len(block)
+
+    # Stream the matches: each block ends where the next serial starts, so
+    # only the previous serial and the last case-type line since it are kept
+    prev = None
+    ctype: Optional[int] = None
+    for match in CASE_TOKEN_PATTERN.finditer(text):
+        if match.lastgroup == "ctype":
+            if prev is not None:
+                ctype = match.start()
+            continue
+        if prev is not None:
+            emit(prev, match.start(), ctype)
+        prev = match
+        ctype = None
+    if prev is None:
+        return {}
+    emit(prev, len(text), ctype)
 
-    return _repair_layout_drift(cases)
+    for key, chunks in connected.items():
+        cases[key] = ''.join(chunks)
+    return _repair_layout_drift(cases, last_types, parent_ends)
 
 
-def _repair_layout_drift(cases: dict[str, str]) -> dict[str, str]:
+def _repair_layout_drift(cases: dict[str, str],
+                         last_types: dict[str, Optional[int]],
+                         parent_ends: dict[str, int]) -> dict[str, str]:
     """
     Fix layout drift where the next case's case-type line appears inside
     the previous block due to OCR reading order.
     Only applies to top-level cases, not Connected sub-case content.
-    """
-    serials = sorted(cases.keys(), key=lambda x: float(x))
-
-    for i in range(len(serials) - 1):
-        current_serial = serials[i]
-        next_serial = serials[i + 1]
-        current_text = cases[current_serial]
 
-        # Only scan the parent portion — stop before any Connected sub-case blocks
-        connected_marker = '\n\n--- Connected Case'
-        parent_end = current_text.find(connected_marker)
-        parent_text = current_text[:parent_end] if parent_end != -1 else current_text
-
-        matches = list(CASE_TYPE_PATTERN.finditer(parent_text))
+    `last_types` holds the offset of each case's last case-type line and
+    `parent_ends` where its Connected sub-cases begin, both collected while
+    segmenting, so the case texts are not rescanned.
+    """
+    # Keys are plain integer strings (sub-serials are filed under their parent)
+    serials = sorted(cases, key=int)
 
-        if not matches:
+    # Decide from the recorded offsets alone; only moved cases are sliced
+    for current_serial, next_serial in zip(serials, serials[1:]):
+        last_start = last_types[current_serial]
+        if last_start is None:
             continue
 
-        last_match = matches[-1]
-        if last_match.start() > len(parent_text) * 0.6:
-            trailing = parent_text[last_match.start():].strip()
-            cases[current_serial] = parent_text[:last_match.start()].strip()
-            if parent_end != -1:
-                cases[current_serial] += current_text[parent_end:]
+        # Only the parent portion counts — Connected sub-case blocks follow it
+        parent_end = parent_ends[current_serial]
+        # Past 60% of the parent text; integer form of last_start > 0.6 * parent_end
+        if last_start * 5 > parent_end * 3:
+            current_text = cases[current_serial]
+            trailing = current_text[last_start:parent_end].strip()
+            kept = current_text[:last_start].strip()
+            cases[current_serial] = kept + current_text[parent_end:]
+            parent_ends[current_serial] = len(kept)
             cases[next_serial] = trailing + "\n" + cases[next_serial]
+            # The moved case-type line now opens the next case's text
+            if last_types[next_serial] is None:
+                last_types[next_serial] = 0
+            else:
+                last_types[next_serial] += len(trailing) + 1
+            parent_ends[next_serial] += len(trailing) + 1
 
     return cases
 
@@ -876,6 +1017,21 @@ def _repair_layout_drift(cases: dict[str, str]) -> dict[str, str]:
 # DISPATCHER
 # ================================
 
+_SEGMENTERS = {
+    "tesseract": segment_cases_tesseract,
+    "azure": segment_cases_azure,
+    "paddle": segment_cases_paddle,
+}
+
+# Retries re-segment identical OCR text, so the last few results are kept,
+# keyed by a digest of the text rather than the text itself (documents are
+# stored by the upload cache, not here). Results are tuples so every caller
+# gets its own dict; segment_cases runs in worker threads, hence the lock.
+SEGMENT_CACHE_SIZE = 4
+_segment_cache: OrderedDict[tuple[bytes, str], tuple[tuple[str, str], ...]] = OrderedDict()
+_segment_cache_lock = threading.Lock()
+
+
 def segment_cases(text: str, selected_engine: str) -> dict[str, str]:
     """
     Segment cases based on the OCR engine used.
@@ -885,16 +1041,40 @@ def segment_cases(text: str, selected_engine: str) -> dict[str, str]:
         selected_engine: 'tesseract', 'azure', or 'paddle'
 
     Returns:
-        Dictionary mapping case identifiers to case content
+        Dictionary mapping case identifiers to case content, ordered by
+        serial number
 
     Raises:
         ValueError: If engine is not supported
     """
-    if selected_engine == "tesseract":
-        return segment_cases_tesseract(text)
-    elif selected_engine == "azure":
-        return segment_cases_azure(text)
-    elif selected_engine == "paddle":
-        return segment_cases_paddle(text)
-    else:
-        raise ValueError(f"Unsupported OCR engine: {selected_engine}")
\ No newline at end of file
+    key = (
+        hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest(),
+        selected_engine,
+    )
+    with _segment_cache_lock:
+        cached = _segment_cache.get(key)
+        if cached is not None:
+            _segment_cache.move_to_end(key)
+    if cached is None:
+        cached = _segment_sorted(text, selected_engine)
+        with _segment_cache_lock:
+            _segment_cache[key] = cached
+            if len(_segment_cache) > SEGMENT_CACHE_SIZE:
+                _segment_cache.popitem(last=False)
+    return dict(cached)
+
+
+def _segment_sorted(text: str,
+                    selected_engine: str) -> tuple[tuple[str, str], ...]:
+    segmenter = _SEGMENTERS.get(selected_engine)
+    if segmenter is None:
+        raise ValueError(f"Unsupported OCR engine: {selected_engine}")
+    # Blank OCR output (e.g. pages that were all image) has no cases
+    if not text or text.isspace():
+        return ()
+    cases = segmenter(text)
+
+    # Sort once here so callers can iterate keys in serial order
+    return tuple(sorted(cases.items(), key=lambda kv: int(kv[0])))